@@ -71,6 +71,7 @@ def get_module_from_data_type(data_type: DataType):
 
 @dataclass
 class CommonAncestor:
+    __slots__ = ("node_id", "node_label", "covered_starting_nodes")
     node_id: Any
     node_label: str
     covered_starting_nodes: Set[str]
@@ -1,4 +1,5 @@
 import json
+import re
 import urllib.request
 
 import yaml
@@ -36,6 +37,8 @@ class GenedescConfigParser(object):
             #     'http://current.geneontology.org/ontology/subsets/gocheck_do_not_annotate.json')
             # self.add_go_do_not_annotate_to_blacklist(
             #     'http://current.geneontology.org/ontology/subsets/gocheck_do_not_manually_annotate.json')
+        # special cases with compiled regexes, by module name
+        self._special_cases_cache = {}
 
     def add_go_do_not_annotate_to_blacklist(self, slim_url):
         response = urllib.request.urlopen(slim_url)
@@ -109,11 +112,14 @@ class GenedescConfigParser(object):
     def get_prepostfix_sentence_map(self, module: Module, special_cases_only: bool = False, humans: bool = False):
         module_name = self._get_module_name(module)
         if special_cases_only:
-            return {prepost["aspect"] + "|" + prepost["group"] + "|" + prepost["qualifier"]: [
-                (sp_case["id"], sp_case["match_regex"], sp_case["prefix"], sp_case["postfix"])
-                for sp_case in prepost["special_cases"]]
-                for prepost in self.config[module_name]["prepostfix_sentences_map"] if
-                "special_cases" in prepost and prepost["special_cases"]}
+            if module_name not in self._special_cases_cache:
+                self._special_cases_cache[module_name] = {
+                    prepost["aspect"] + "|" + prepost["group"] + "|" + prepost["qualifier"]: [
+                        (sp_case["id"], re.compile(sp_case["match_regex"]), sp_case["prefix"], sp_case["postfix"])
+                        for sp_case in prepost["special_cases"]]
+                    for prepost in self.config[module_name]["prepostfix_sentences_map"] if
+                    "special_cases" in prepost and prepost["special_cases"]}
+            return self._special_cases_cache[module_name]
         else:
             prepost_map = {prepost["aspect"] + "|" + prepost["group"] + "|" + prepost["qualifier"]: (
                 prepost["prefix"], prepost["postfix"]) for prepost in self.config[module_name][
@@ -240,8 +240,8 @@ class DataManager(object):
                 relations = None
             slim_onto = OntologyFactory().create(self._get_cached_file(file_source_url=slim_url, cache_path=slim_cache_path)
                                                  ).subontology(relations=relations)
-            slim_set = set([node for node in slim_onto.nodes() if "type" in slim_onto.node(node) and
-                            slim_onto.node(node)["type"] == "CLASS"])
+            slim_set = frozenset([node for node in slim_onto.nodes() if "type" in slim_onto.node(node) and
+                                  slim_onto.node(node)["type"] == "CLASS"])
             if module == Module.GO:
                 logger.info("Setting GO Slim")
                 self.go_slim = slim_set
@@ -272,6 +272,20 @@ class DataManager(object):
                 new_associations.append(association)
         return AssociationSetFactory().create_from_assocs(assocs=new_associations, ontology=ontology)
 
+    @staticmethod
+    def share_node_ids_with_ontology(association_set: AssociationSet, ontology: Ontology) -> None:
+        """replace the term ids of the associations with the equal id objects used as node ids by the ontology, so that
+        set and dict lookups mixing annotated terms and ontology nodes match by identity without comparing strings
+
+        Args:
+            association_set (AssociationSet): the association set to modify in place
+            ontology (Ontology): the ontology linked to the annotations
+        """
+        node_ids = {node_id: node_id for node_id in ontology.nodes()}
+        for subj_associations in association_set.associations_by_subj.values():
+            for association in subj_associations:
+                association["object"]["id"] = node_ids.get(association["object"]["id"], association["object"]["id"])
+
     def set_associations(self, associations_type: DataType, associations: AssociationSet, config: GenedescConfigParser):
         """set the go annotations and remove blacklisted annotations
 
@@ -288,6 +302,8 @@ class DataManager(object):
             association_set=assocs, ontology=self.get_ontology(associations_type),
             terms_blacklist=config.get_module_property(module=get_module_from_data_type(associations_type),
                                                        prop=ConfigModuleProperty.EXCLUDE_TERMS))
+        if self.get_ontology(associations_type) is not None:
+            self.share_node_ids_with_ontology(association_set=assocs, ontology=self.get_ontology(associations_type))
 
         if associations_type == DataType.GO:
             logger.info("Setting GO associations")
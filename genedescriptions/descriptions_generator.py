@@ -1,4 +1,5 @@
-from typing import Set
+import os
+from typing import Set, FrozenSet
 
 import inflect
 import re
@@ -14,25 +15,36 @@ logger = logging.getLogger(__name__)
 
 
 class ModuleSentences(object):
+    __slots__ = ("sentences",)
+
     def __init__(self, sentences):
         self.sentences = sentences
 
     def get_description(self):
-        return ". ".join([sentence.text[0].upper() + sentence.text[1:] for sentence in self.sentences])
+        return ". ".join(sentence.text[0].upper() + sentence.text[1:] for sentence in self.sentences)
+
+    def _get_sentences(self, experimental_only: bool = False):
+        if experimental_only:
+            return [sentence for sentence in self.sentences if sentence.evidence_group.startswith("EXPERIMENTAL")]
+        return self.sentences
 
     def get_ids(self, experimental_only: bool = False):
-        return list({term_id for sentence in self.sentences for term_id in sentence.terms_ids if not experimental_only or
-                     sentence.evidence_group.startswith("EXPERIMENTAL")})
+        return list({term_id for sentence in self._get_sentences(experimental_only) for term_id in
+                     sentence.terms_ids})
 
     def get_initial_ids(self, experimental_only: bool = False):
-        return list({term_id for sentence in self.sentences for term_id in sentence.initial_terms_ids if not
-                     experimental_only or sentence.evidence_group.startswith("EXPERIMENTAL")})
+        return list({term_id for sentence in self._get_sentences(experimental_only) for term_id in
+                     sentence.initial_terms_ids})
 
     def contains_sentences(self):
         return len(self.sentences) > 0
 
 
 class SentenceMerger(object):
+    __slots__ = ("initial_terms_ids", "postfix_list", "terms_ids", "term_postfix_dict", "evidence_groups",
+                 "term_evgroup_dict", "additional_prefix", "aspect", "qualifier", "ancestors_covering_multiple_terms",
+                 "any_trimmed")
+
     def __init__(self):
         self.initial_terms_ids = set()
         self.postfix_list = []
@@ -62,16 +74,29 @@ class OntologySentenceGenerator(object):
         self.config = config
         self.module = module
         self.terms_already_covered = set()
-        self.terms_groups = defaultdict(lambda: defaultdict(set))
+        self._ancestors_cache = {}
+        self._labels_cache = {}
+        self.terms_groups = defaultdict(set)
+        self.aspect_qualifier_evidence_groups = defaultdict(set)
         self.evidence_groups_priority_list = config.get_evidence_groups_priority_list(module=module)
+        self.evidence_groups_priority = {}
         self.prepostfix_sentences_map = config.get_prepostfix_sentence_map(module=module, humans=humans)
+        exclude_terms = config.get_module_property(module=module, prop=ConfigModuleProperty.EXCLUDE_TERMS)
+        self.exclude_terms = frozenset(exclude_terms) if exclude_terms else frozenset()
+        self.remove_overlap = config.get_module_property(module=module, prop=ConfigModuleProperty.REMOVE_OVERLAP)
+        self.del_parents_if_child = config.get_module_property(module=module,
+                                                               prop=ConfigModuleProperty.DEL_PARENTS_IF_CHILD)
+        self.del_children_if_parent = config.get_module_property(module=module,
+                                                                 prop=ConfigModuleProperty.DEL_CHILDREN_IF_PARENT)
+        self.max_num_terms = config.get_module_property(module=module,
+                                                        prop=ConfigModuleProperty.MAX_NUM_TERMS_IN_SENTENCE)
         self.gene_annots = data_manager.get_annotations_for_gene(
             gene_id=gene_id, annot_type=get_data_type_from_module(module),
             priority_list=config.get_annotations_priority(module=module))
         self.trimmer = CONF_TO_TRIMMING_CLASS[config.get_module_property(
             module=module, prop=ConfigModuleProperty.TRIMMING_ALGORITHM)](
             ontology=self.ontology, annotations=data_manager.get_associations(get_data_type_from_module(module)),
-            nodeids_blacklist=config.get_module_property(module=module, prop=ConfigModuleProperty.EXCLUDE_TERMS),
+            nodeids_blacklist=self.exclude_terms,
             slim_terms_ic_bonus_perc=config.get_module_property(module=module, prop=ConfigModuleProperty.SLIM_BONUS_PERC),
             slim_set=data_manager.get_slim(module=module))
         self.set_terms_groups(module, config, limit_to_group, humans)
@@ -90,15 +115,18 @@ class OntologySentenceGenerator(object):
                     qualifier = "_".join(sorted(annotation["qualifiers"])) if "qualifiers" in annotation else ""
                     if prepostfix_special_cases_sent_map and aspect + "|" + ev_group + "|" + qualifier in \
                        prepostfix_special_cases_sent_map:
+                        term_label = self.get_label(annotation["object"]["id"])
                         for special_case in prepostfix_special_cases_sent_map[aspect + "|" + ev_group + "|" + qualifier]:
-                            if re.match(special_case[1], self.ontology.label(annotation["object"]["id"], id_if_null=True)):
+                            if special_case[1].match(term_label):
                                 ev_group = evidence_codes_groups_map[annotation["evidence"]["type"]] + \
                                            str(special_case[0])
                                 if ev_group not in self.evidence_groups_priority_list:
                                     self.evidence_groups_priority_list.insert(self.evidence_groups_priority_list.index(
                                         evidence_codes_groups_map[annotation["evidence"]["type"]]) + 1, ev_group)
                                 break
-                    self.terms_groups[(aspect, qualifier)][ev_group].add(annotation["object"]["id"])
+                    self.terms_groups[(aspect, qualifier, ev_group)].add(annotation["object"]["id"])
+                    self.aspect_qualifier_evidence_groups[(aspect, qualifier)].add(ev_group)
+        self.evidence_groups_priority = {eg: p for p, eg in enumerate(self.evidence_groups_priority_list)}
 
     def get_module_sentences(self, aspect: str, qualifier: str = '',
                              keep_only_best_group: bool = False, merge_groups_with_same_prefix: bool = False):
@@ -115,19 +143,22 @@ class OntologySentenceGenerator(object):
             ModuleSentences: the module sentences
         """
         sentences = []
-        evidence_group_priority = {eg: p for p, eg in enumerate(self.evidence_groups_priority_list)}
         rename_cell = self.config.get_module_property(module=self.module, prop=ConfigModuleProperty.RENAME_CELL)
         dist_root = self.config.get_module_property(module=self.module, prop=ConfigModuleProperty.DISTANCE_FROM_ROOT)
         add_mul_comanc = self.config.get_module_property(module=self.module,
                                                          prop=ConfigModuleProperty.ADD_MULTIPLE_TO_COMMON_ANCEST)
+        several_word = self.config.get_module_property(module=self.module,
+                                                       prop=ConfigModuleProperty.CUTOFF_SEVERAL_WORD)
+        several_category_words = self.config.get_module_property(
+            module=self.module, prop=ConfigModuleProperty.CUTOFF_SEVERAL_CATEGORY_WORD)
         best_group = ""
-        for terms, evidence_group, priority in sorted([(t, eg, evidence_group_priority[eg]) for eg, t in
-                                                       self.terms_groups[(aspect, qualifier)].items()],
-                                                      key=lambda x: x[2]):
+        for evidence_group in sorted(self.aspect_qualifier_evidence_groups.get((aspect, qualifier), []),
+                                     key=self.evidence_groups_priority.get):
             if not best_group or re.match(best_group + r"([0-9]*)?", evidence_group):
+                terms = self.terms_groups[(aspect, qualifier, evidence_group)]
                 trimming_result = self.reduce_num_terms(terms=terms, min_distance_from_root=dist_root[aspect])
-                if aspect + "|" + evidence_group + "|" + qualifier in self.prepostfix_sentences_map \
-                        and len(trimming_result.final_terms) > 0:
+                if len(trimming_result.final_terms) > 0 and aspect + "|" + evidence_group + "|" + qualifier in \
+                        self.prepostfix_sentences_map:
                     sentences.append(
                         _get_single_sentence(
                             initial_terms_ids=list(terms),
@@ -136,20 +167,16 @@ class OntologySentenceGenerator(object):
                             prepostfix_sentences_map=self.prepostfix_sentences_map,
                             terms_merged=False, trimmed=trimming_result.trimming_applied,
                             add_others=trimming_result.partial_coverage,
-                            truncate_others_generic_word=self.config.get_module_property(
-                                module=self.module, prop=ConfigModuleProperty.CUTOFF_SEVERAL_WORD),
-                            truncate_others_aspect_words=self.config.get_module_property(
-                                module=self.module, prop=ConfigModuleProperty.CUTOFF_SEVERAL_CATEGORY_WORD),
+                            truncate_others_generic_word=several_word,
+                            truncate_others_aspect_words=several_category_words,
                             ancestors_with_multiple_children=trimming_result.multicovering_nodes if add_mul_comanc else
                             None, rename_cell=rename_cell, config=self.config,
                             put_anatomy_male_at_end=True if aspect == 'A' else False))
                     if keep_only_best_group and not best_group:
                         best_group = evidence_group
         if merge_groups_with_same_prefix:
-            remove_parents = self.config.get_module_property(module=self.module,
-                                                             prop=ConfigModuleProperty.DEL_PARENTS_IF_CHILD)
             sentences = self.merge_sentences_with_same_prefix(
-                sentences=sentences, remove_parent_terms=remove_parents, rename_cell=rename_cell,
+                sentences=sentences, remove_parent_terms=self.del_parents_if_child, rename_cell=rename_cell,
                 put_anatomy_male_at_end=True if aspect == 'A' else False)
         return ModuleSentences(sentences)
 
@@ -166,54 +193,76 @@ class OntologySentenceGenerator(object):
             TrimmingResult: the reduced set of terms with additional information on the nature of the terms
         """
         trimming_result = TrimmingResult()
-        if self.config.get_module_property(module=self.module, prop=ConfigModuleProperty.REMOVE_OVERLAP):
+        # work on a copy so that the terms stored in the terms groups are not modified
+        terms = set(terms)
+        if self.remove_overlap:
             terms -= self.terms_already_covered
-        exclude_terms = self.config.get_module_property(module=self.module, prop=ConfigModuleProperty.EXCLUDE_TERMS)
-        if exclude_terms:
-            terms -= set(exclude_terms)
-        if self.config.get_module_property(module=self.module, prop=ConfigModuleProperty.DEL_PARENTS_IF_CHILD):
-            terms = OntologySentenceGenerator.remove_parents_if_child_present(terms, self.ontology,
-                                                                              self.terms_already_covered)
-        max_terms = self.config.get_module_property(module=self.module,
-                                                    prop=ConfigModuleProperty.MAX_NUM_TERMS_IN_SENTENCE)
-        if 0 < max_terms < len(terms):
-            trimming_result = self.trimmer.trim(terms, max_terms, min_distance_from_root)
+        terms -= self.exclude_terms
+        if self.del_parents_if_child:
+            terms = self.remove_parents_if_child_present(terms, self.terms_already_covered)
+        trim_terms = 0 < self.max_num_terms < len(terms)
+        if trim_terms:
+            trimming_result = self.trimmer.trim(terms, self.max_num_terms, min_distance_from_root)
         else:
             trimming_result.final_terms = terms
             trimming_result.covered_nodes = terms
             self.terms_already_covered.update(terms)
-        if self.config.get_module_property(module=self.module, prop=ConfigModuleProperty.DEL_CHILDREN_IF_PARENT):
+        # if parents have already been removed and no trimming occurred, no term can be a child of another one
+        if self.del_children_if_parent and (trim_terms or not self.del_parents_if_child):
             trimming_result.final_terms = self.remove_children_if_parents_present(
-                terms=trimming_result.final_terms, ontology=self.ontology,
-                terms_already_covered=self.terms_already_covered,
+                terms=trimming_result.final_terms, terms_already_covered=self.terms_already_covered,
                 ancestors_covering_multiple_children=trimming_result.multicovering_nodes)
         return trimming_result
 
-    @staticmethod
-    def remove_children_if_parents_present(terms, ontology, terms_already_covered: Set[str] = None,
+    def get_ancestors(self, node_id: str) -> FrozenSet[str]:
+        """get the ancestors of a node, caching the result since the ontology does not change during the lifetime of
+        the generator
+
+        Args:
+            node_id (str): the id of the node
+        Returns:
+            FrozenSet[str]: the set of ancestors of the node
+        """
+        if node_id not in self._ancestors_cache:
+            self._ancestors_cache[node_id] = frozenset(self.ontology.ancestors(node_id))
+        return self._ancestors_cache[node_id]
+
+    def get_label(self, node_id: str) -> str:
+        """get the label of a node, or its id if the label is missing, caching the result
+
+        Args:
+            node_id (str): the id of the node
+        Returns:
+            str: the label of the node
+        """
+        if node_id not in self._labels_cache:
+            self._labels_cache[node_id] = self.ontology.label(node_id, id_if_null=True)
+        return self._labels_cache[node_id]
+
+    def remove_children_if_parents_present(self, terms, terms_already_covered: Set[str] = None,
                                            ancestors_covering_multiple_children: Set[str] = None):
         terms_nochildren = []
+        terms_set = terms if isinstance(terms, set) else set(terms)
         for term in terms:
-            if len(set(ontology.ancestors(term)).intersection(set(terms))) == 0:
+            parents_in_terms = self.get_ancestors(term) & terms_set
+            if not parents_in_terms:
                 terms_nochildren.append(term)
             elif ancestors_covering_multiple_children is not None:
-                ancestors_covering_multiple_children.update({ontology.label(term_id, id_if_null=True) for term_id in
-                                                             set(ontology.ancestors(term)).intersection(set(terms))})
+                ancestors_covering_multiple_children.update(self.get_label(term_id) for term_id in parents_in_terms)
         if len(terms_nochildren) < len(terms):
             if terms_already_covered is not None:
-                terms_already_covered.update(set(terms) - set(terms_nochildren))
+                terms_already_covered.update(terms_set.difference(terms_nochildren))
             logger.debug("Removed " + str(len(terms) - len(terms_nochildren)) + " children from terms")
             return terms_nochildren
         else:
             return terms
 
-    @staticmethod
-    def remove_parents_if_child_present(terms, ontology, terms_already_covered: Set[str] = None):
-        terms_no_ancestors = list(set(terms) - set([ancestor for node_id in terms for ancestor in
-                                                    ontology.ancestors(node_id)]))
+    def remove_parents_if_child_present(self, terms, terms_already_covered: Set[str] = None):
+        terms_set = terms if isinstance(terms, set) else set(terms)
+        terms_no_ancestors = list(terms_set - set().union(*(self.get_ancestors(node_id) for node_id in terms)))
         if len(terms) > len(terms_no_ancestors):
             if terms_already_covered is not None:
-                terms_already_covered.update(set(terms) - set(terms_no_ancestors))
+                terms_already_covered.update(terms_set.difference(terms_no_ancestors))
             logger.debug("Removed " + str(len(terms) - len(terms_no_ancestors)) + " parents from terms")
             return terms_no_ancestors
         else:
@@ -233,50 +282,49 @@ class OntologySentenceGenerator(object):
         """
         merged_sentences = defaultdict(SentenceMerger)
         for sentence in sentences:
-            prefix = self.prepostfix_sentences_map[sentence.aspect + "|" + sentence.evidence_group + "|" + sentence.qualifier][0]
-            merged_sentences[prefix].postfix_list.append(self.prepostfix_sentences_map[sentence.aspect + "|" +
-                                                                                       sentence.evidence_group + "|" +
-                                                                                       sentence.qualifier][1])
-            merged_sentences[prefix].aspect = sentence.aspect
-            merged_sentences[prefix].qualifier = sentence.qualifier
-            merged_sentences[prefix].terms_ids.update(sentence.terms_ids)
-            merged_sentences[prefix].initial_terms_ids.update(sentence.initial_terms_ids)
-            for term in sentence.terms_ids:
-                merged_sentences[prefix].term_postfix_dict[term] = self.prepostfix_sentences_map[
-                    sentence.aspect + "|" + sentence.evidence_group + "|" + sentence.qualifier][1]
-            merged_sentences[prefix].evidence_groups.append(sentence.evidence_group)
-            for term in sentence.terms_ids:
-                merged_sentences[prefix].term_evgroup_dict[term] = sentence.evidence_group
+            prefix, postfix = self.prepostfix_sentences_map[sentence.aspect + "|" + sentence.evidence_group + "|" +
+                                                            sentence.qualifier]
+            sent_merger = merged_sentences[prefix]
+            sent_merger.postfix_list.append(postfix)
+            sent_merger.aspect = sentence.aspect
+            sent_merger.qualifier = sentence.qualifier
+            sent_merger.terms_ids.update(sentence.terms_ids)
+            sent_merger.initial_terms_ids.update(sentence.initial_terms_ids)
+            sent_merger.term_postfix_dict.update(dict.fromkeys(sentence.terms_ids, postfix))
+            sent_merger.evidence_groups.append(sentence.evidence_group)
+            sent_merger.term_evgroup_dict.update(dict.fromkeys(sentence.terms_ids, sentence.evidence_group))
             if sentence.additional_prefix:
-                merged_sentences[prefix].additional_prefix = sentence.additional_prefix
-            merged_sentences[prefix].ancestors_covering_multiple_terms.update(
-                sentence.ancestors_covering_multiple_terms)
-            merged_sentences[prefix].any_trimmed = merged_sentences[prefix].any_trimmed or sentence.trimmed
+                sent_merger.additional_prefix = sentence.additional_prefix
+            sent_merger.ancestors_covering_multiple_terms.update(sentence.ancestors_covering_multiple_terms)
+            sent_merger.any_trimmed = sent_merger.any_trimmed or sentence.trimmed
         if remove_parent_terms:
+            ancestors_by_term = {node_id: self.get_ancestors(node_id) for node_id in set().union(
+                *(sent_merger.terms_ids for sent_merger in merged_sentences.values()))}
             for prefix, sent_merger in merged_sentences.items():
-                terms_no_ancestors = sent_merger.terms_ids - set([ancestor for node_id in sent_merger.terms_ids for
-                                                                  ancestor in self.ontology.ancestors(node_id)])
+                terms_no_ancestors = sent_merger.terms_ids - set().union(
+                    *(ancestors_by_term[node_id] for node_id in sent_merger.terms_ids))
                 if len(sent_merger.terms_ids) > len(terms_no_ancestors):
                     logger.debug("Removed " + str(len(sent_merger.terms_ids) - len(terms_no_ancestors)) +
                                  " parents from terms while merging sentences with same prefix")
                     sent_merger.terms_ids = terms_no_ancestors
-        return [Sentence(prefix=prefix, initial_terms_ids=list(sent_merger.initial_terms_ids),
-                         terms_ids=list(sent_merger.terms_ids),
-                         postfix=OntologySentenceGenerator.merge_postfix_phrases(sent_merger.postfix_list),
-                         text=compose_sentence(prefix=prefix,
-                                               term_names=[self.ontology.label(node, id_if_null=True) for node in
-                                                           sent_merger.terms_ids],
-                                               postfix=OntologySentenceGenerator.merge_postfix_phrases(
-                                                   sent_merger.postfix_list),
-                                               additional_prefix=sent_merger.additional_prefix,
-                                               ancestors_with_multiple_children=sent_merger.ancestors_covering_multiple_terms,
-                                               rename_cell=rename_cell, config=self.config,
-                                               put_anatomy_male_at_end=put_anatomy_male_at_end),
-                         aspect=sent_merger.aspect, evidence_group=", ".join(sent_merger.evidence_groups),
-                         terms_merged=True, trimmed=sent_merger.any_trimmed,
-                         additional_prefix=sent_merger.additional_prefix, qualifier=sent_merger.qualifier,
-                         ancestors_covering_multiple_terms=sent_merger.ancestors_covering_multiple_terms)
-                for prefix, sent_merger in merged_sentences.items() if len(sent_merger.terms_ids) > 0]
+        merged_sentences_list = []
+        for prefix, sent_merger in merged_sentences.items():
+            if len(sent_merger.terms_ids) > 0:
+                postfix = OntologySentenceGenerator.merge_postfix_phrases(sent_merger.postfix_list)
+                term_names = [self.get_label(node) for node in sent_merger.terms_ids]
+                merged_sentences_list.append(Sentence(
+                    prefix=prefix, initial_terms_ids=list(sent_merger.initial_terms_ids),
+                    terms_ids=list(sent_merger.terms_ids), postfix=postfix,
+                    text=compose_sentence(prefix=prefix, term_names=term_names, postfix=postfix,
+                                          additional_prefix=sent_merger.additional_prefix,
+                                          ancestors_with_multiple_children=sent_merger.ancestors_covering_multiple_terms,
+                                          rename_cell=rename_cell, config=self.config,
+                                          put_anatomy_male_at_end=put_anatomy_male_at_end),
+                    aspect=sent_merger.aspect, evidence_group=", ".join(sent_merger.evidence_groups),
+                    terms_merged=True, trimmed=sent_merger.any_trimmed,
+                    additional_prefix=sent_merger.additional_prefix, qualifier=sent_merger.qualifier,
+                    ancestors_covering_multiple_terms=sent_merger.ancestors_covering_multiple_terms))
+        return merged_sentences_list
 
     @staticmethod
     def merge_postfix_phrases(postfix_phrases: List[str]) -> str:
@@ -287,26 +335,14 @@ class OntologySentenceGenerator(object):
         Returns:
             str: the merged postfix phrase
         """
-        postfix_phrases = [postfix for postfix in postfix_phrases if postfix]
+        postfix_phrases = list(dict.fromkeys(postfix for postfix in postfix_phrases if postfix))
         if postfix_phrases and len(postfix_phrases) > 0:
             if len(postfix_phrases) > 1:
                 inf_engine = inflect.engine()
-                shortest_phrase = sorted(zip(postfix_phrases, [len(phrase) for phrase in postfix_phrases]),
-                                         key=lambda x: x[1])[0][0]
-                first_part = ""
-                for idx, letter in enumerate(shortest_phrase):
-                    if all(map(lambda x: x[idx] == shortest_phrase[idx], postfix_phrases)):
-                        first_part += letter
-                    else:
-                        break
-                last_part = ""
-                for idx, letter in zip(range(len(shortest_phrase)), reversed([l for l in shortest_phrase])):
-                    if all(map(lambda x: x[len(x) - idx - 1] == shortest_phrase[len(shortest_phrase) - idx - 1],
-                               postfix_phrases)):
-                        last_part = letter + last_part
-                    else:
-                        break
-                new_phrases = [phrase.replace(first_part, "").replace(last_part, "") for phrase in postfix_phrases]
+                first_part = os.path.commonprefix(postfix_phrases)
+                # the common suffix is searched in what remains after the prefix, so that the two never overlap
+                last_part = os.path.commonprefix([phrase[len(first_part):][::-1] for phrase in postfix_phrases])[::-1]
+                new_phrases = [phrase[len(first_part):len(phrase) - len(last_part)] for phrase in postfix_phrases]
                 if len(last_part.strip().split(" ")) == 1:
                     last_part = inf_engine.plural(last_part)
                 if len(new_phrases) > 2:
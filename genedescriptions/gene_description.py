@@ -175,15 +175,17 @@ class GeneDescription(object):
     def _get_module_initial_set(aspect: str, sentence_generator: OntologySentenceGenerator, main_qualifier: str = "",
                                 additional_qualifier: str = None):
         if not additional_qualifier:
-            return [elem for key, sets in sentence_generator.terms_groups[(aspect, main_qualifier)].items() for elem
-                    in sets if (aspect, key, main_qualifier) in sentence_generator.prepostfix_sentences_map]
+            return GeneDescription._get_qualifier_initial_terms(aspect, sentence_generator, main_qualifier)
         else:
             return list(set().union(
-                [elem for key, sets in sentence_generator.terms_groups[(aspect, main_qualifier)].items() for elem in
-                 sets if (aspect, key, main_qualifier) in sentence_generator.prepostfix_sentences_map],
-                [elem for key, sets in sentence_generator.terms_groups[
-                    (aspect, additional_qualifier)].items() for elem in sets if (aspect, key, additional_qualifier) in
-                 sentence_generator.prepostfix_sentences_map]))
+                GeneDescription._get_qualifier_initial_terms(aspect, sentence_generator, main_qualifier),
+                GeneDescription._get_qualifier_initial_terms(aspect, sentence_generator, additional_qualifier)))
+
+    @staticmethod
+    def _get_qualifier_initial_terms(aspect: str, sentence_generator: OntologySentenceGenerator, qualifier: str):
+        return [elem for ev_group in sentence_generator.aspect_qualifier_evidence_groups.get((aspect, qualifier), [])
+                for elem in sentence_generator.terms_groups[(aspect, qualifier, ev_group)] if
+                aspect + "|" + ev_group + "|" + qualifier in sentence_generator.prepostfix_sentences_map]
 
     def set_or_update_initial_stats(self, module: Module, sent_generator: OntologySentenceGenerator,
                                     module_sentences: ModuleSentences):
@@ -12,6 +12,27 @@ from genedescriptions.commons import CommonAncestor
 logger = logging.getLogger(__name__)
 
 
+def get_node_namespace(ontology: Ontology, node_id: str) -> Union[None, str]:
+    """
+    Get the OBO namespace of a node, storing it in the node properties so that the node metadata is walked only once
+
+    Args:
+        ontology (Ontology): the ontology to which the node belongs
+        node_id (str): the id of the node
+
+    Returns:
+        Union[None, str]: the namespace of the node, or None if the node does not have one
+    """
+    onto_node = ontology.node(node_id)
+    if "namespace" not in onto_node:
+        onto_node["namespace"] = None
+        if "meta" in onto_node and "basicPropertyValues" in onto_node["meta"]:
+            for basic_prop_val in onto_node["meta"]["basicPropertyValues"]:
+                if basic_prop_val["pred"] == "OIO:hasOBONamespace":
+                    onto_node["namespace"] = basic_prop_val["val"]
+    return onto_node["namespace"]
+
+
 def nodes_have_same_root(node_ids: List[str], ontology: Ontology) -> Union[bool, str]:
     """
     Check whether all provided nodes are connected to the same root only
@@ -26,13 +47,11 @@ def nodes_have_same_root(node_ids: List[str], ontology: Ontology) -> Union[bool,
     """
     common_root = None
     for node_id in node_ids:
-        onto_node = ontology.node(node_id)
-        if "meta" in onto_node and "basicPropertyValues" in onto_node["meta"]:
-            for basic_prop_val in onto_node["meta"]["basicPropertyValues"]:
-                if basic_prop_val["pred"] == "OIO:hasOBONamespace":
-                    if common_root and common_root != basic_prop_val["val"]:
-                        return False
-                    common_root = basic_prop_val["val"]
+        node_root = get_node_namespace(ontology=ontology, node_id=node_id)
+        if node_root is not None:
+            if common_root and common_root != node_root:
+                return False
+            common_root = node_root
     return common_root
 
 
@@ -53,22 +72,23 @@ def get_all_common_ancestors(node_ids: List[str], ontology: Ontology, min_distan
     common_root = nodes_have_same_root(node_ids=node_ids, ontology=ontology)
     if common_root is False:
         raise ValueError("Cannot get common ancestors of nodes connected to different roots")
-    ancestors = defaultdict(list)
+    node_ids_set = set(node_ids)
+    ancestors = defaultdict(set)
+    # the same ancestors are shared by many starting nodes, so check whether each of them is valid only once
+    valid_ancestors = {}
     for node_id in node_ids:
         for ancestor in ontology.ancestors(node=node_id, reflexive=True):
-            onto_anc = ontology.node(ancestor)
-            onto_anc_root = None
-            if "meta" in onto_anc and "basicPropertyValues" in onto_anc["meta"]:
-                for basic_prop_val in onto_anc["meta"]["basicPropertyValues"]:
-                    if basic_prop_val["pred"] == "OIO:hasOBONamespace":
-                        onto_anc_root = basic_prop_val["val"]
-            if (ancestor in node_ids or onto_anc["depth"] >= min_distance_from_root) and (
-                not onto_anc_root or onto_anc_root == common_root) and (not nodeids_blacklist or ancestor not in
-                                                                        nodeids_blacklist):
-                ancestors[ancestor].append(node_id)
+            if ancestor not in valid_ancestors:
+                onto_anc_root = get_node_namespace(ontology=ontology, node_id=ancestor)
+                valid_ancestors[ancestor] = (ancestor in node_ids_set or ontology.node(ancestor)["depth"] >=
+                                             min_distance_from_root) and (
+                    not onto_anc_root or onto_anc_root == common_root) and (not nodeids_blacklist or ancestor not in
+                                                                            nodeids_blacklist)
+            if valid_ancestors[ancestor]:
+                ancestors[ancestor].add(node_id)
     return [CommonAncestor(node_id=ancestor, node_label=ontology.label(ancestor),
-                           covered_starting_nodes=set(covered_nodes)) for ancestor, covered_nodes in
-            ancestors.items() if len(covered_nodes) > 1 or ancestor == covered_nodes[0]]
+                           covered_starting_nodes=covered_nodes) for ancestor, covered_nodes in
+            ancestors.items() if len(covered_nodes) > 1 or ancestor in covered_nodes]
 
 
 def set_all_depths(ontology: Ontology, relations: List[str] = None, comparison_func=max):
@@ -1,3 +1,4 @@
+import heapq
 import logging
 from typing import List, Tuple, Union, Set
 
@@ -10,7 +11,7 @@ logger = logging.getLogger(__name__)
 
 
 def find_set_covering(subsets: List[CommonAncestor], ontology: Ontology = None, value: List[float] = None,
-                      max_num_subsets: int = None) -> Union[None, List[Tuple[str, Set[str]]]]:
+                      max_num_subsets: int = None) -> Union[None, Tuple[List[Tuple[str, Set[str]]], Set[str]]]:
     """greedy algorithm to solve set covering problem on subsets of trimming candidates
 
     Args:
@@ -20,32 +21,52 @@ def find_set_covering(subsets: List[CommonAncestor], ontology: Ontology = None,
         value (List[float]): list of costs of the subsets
         max_num_subsets (int): maximum number of subsets in the final list
     Returns:
-        Union[None, List[str]]: the list of IDs of the subsets that maximize coverage with respect to the elements
-                                in the element universe
+        Union[None, Tuple[List[Tuple[str, Set[str]]], Set[str]]]: the list of IDs of the subsets that maximize
+                                coverage with respect to the elements in the element universe, each with its set of
+                                elements, together with the set of elements covered by the selected subsets
     """
     logger.debug("starting set covering optimization")
     elem_to_process = {subset.node_id for subset in subsets}
     if value and len(value) != len(elem_to_process):
         return None
     universe = set([e for subset in subsets for e in subset.covered_starting_nodes])
-    included_elmts = set()
-    included_sets = []
-    while len(elem_to_process) > 0 and included_elmts != universe and (not max_num_subsets or len(included_sets) <
-                                                                       max_num_subsets):
-        if value:
-            effect_sets = sorted([(v * len(s.covered_starting_nodes - included_elmts), s.covered_starting_nodes,
-                                   s.node_label, s.node_id) for s, v in zip(subsets, value) if s.node_id in
-                                  elem_to_process], key=lambda x: (- x[0], x[2]))
-        else:
-            effect_sets = sorted([(len(s.covered_starting_nodes - included_elmts), s.covered_starting_nodes,
-                                   s.node_label, s.node_id) for s in subsets if s.node_id in elem_to_process],
-                                 key=lambda x: (- x[0], x[2]))
-        elem_to_process.remove(effect_sets[0][3])
+    # represent the covered elements of each subset as a bitmask over the universe, so that marginal gains are computed
+    # with integer operations instead of set differences
+    elements_bits = {elem: 1 << i for i, elem in enumerate(universe)}
+    subsets_masks = [sum(elements_bits[elem] for elem in subset.covered_starting_nodes) for subset in subsets]
+    universe_mask = (1 << len(universe)) - 1
+    included_mask = 0
+    included_sets = {}
+    # ancestors of the included subsets, retrieved from the ontology once per subset
+    included_sets_ancestors = {}
+    # subsets covering the same elements have the same marginal gain at every step, so only the one that would be
+    # selected first among them is a real candidate
+    best_key_by_coverage = {}
+    for idx, subset in enumerate(subsets):
+        key = (- (value[idx] if value else 1) * len(subset.covered_starting_nodes), subset.node_label, idx)
+        coverage = frozenset(subset.covered_starting_nodes)
+        if coverage not in best_key_by_coverage or key < best_key_by_coverage[coverage]:
+            best_key_by_coverage[coverage] = key
+    # lazy greedy: gains can only decrease as elements get covered, so the gain stored in the heap is an upper bound
+    # and a subset is selected only when its refreshed gain is still the highest one
+    heap = list(best_key_by_coverage.values())
+    heapq.heapify(heap)
+    while heap and len(elem_to_process) > 0 and included_mask != universe_mask and (
+            not max_num_subsets or len(included_sets) < max_num_subsets):
+        neg_gain, node_label, idx = heapq.heappop(heap)
+        best_set = subsets[idx]
+        if best_set.node_id not in elem_to_process:
+            continue
+        gain = (value[idx] if value else 1) * bin(subsets_masks[idx] & ~included_mask).count("1")
+        if gain != - neg_gain:
+            heapq.heappush(heap, (- gain, node_label, idx))
+            continue
+        elem_to_process.remove(best_set.node_id)
         if ontology:
-            for elem in included_sets:
-                if effect_sets[0][3] in ontology.ancestors(elem[0]):
-                    included_sets.remove(elem)
-        included_elmts |= effect_sets[0][1]
-        included_sets.append((effect_sets[0][3], effect_sets[0][1]))
+            included_sets = {node_id: covered_elmts for node_id, covered_elmts in included_sets.items() if
+                             best_set.node_id not in included_sets_ancestors[node_id]}
+            included_sets_ancestors[best_set.node_id] = set(ontology.ancestors(best_set.node_id))
+        included_mask |= subsets_masks[idx]
+        included_sets[best_set.node_id] = best_set.covered_starting_nodes
     logger.debug("finished set covering optimization")
-    return included_sets
+    return list(included_sets.items()), set().union(*included_sets.values())
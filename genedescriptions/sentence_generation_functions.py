@@ -83,14 +83,13 @@ def _get_single_sentence(initial_terms_ids: List[str], node_ids: List[str], onto
         Union[Sentence,None]: the combined go sentence
     """
     if len(node_ids) > 0:
-        prefix = prepostfix_sentences_map[aspect + "|" + evidence_group + "|" + qualifier][0]
+        prefix, postfix = prepostfix_sentences_map[aspect + "|" + evidence_group + "|" + qualifier]
         additional_prefix = ""
         others_word = "entities"
         if aspect in truncate_others_aspect_words:
             others_word = truncate_others_aspect_words[aspect]
         if add_others:
             additional_prefix += truncate_others_generic_word + " " + others_word + ", including"
-        postfix = prepostfix_sentences_map[aspect + "|" + evidence_group + "|" + qualifier][1]
         term_labels = [ontology.label(node_id, id_if_null=True) for node_id in node_ids]
         if ancestors_with_multiple_children is None:
             ancestors_with_multiple_children = set()
@@ -155,9 +154,7 @@ def get_best_human_ortholog_for_info_poor(human_orthologs, evidence_codes, human
                     else:
                         predicted_orthologs[ortholog[0]] += 1
         if len(exp_orthologs) > 0:
-            best_orth = sorted([(key, value) for key, value in exp_orthologs.items()], key=lambda x: x[1],
-                               reverse=True)[0][0]
+            best_orth = max(exp_orthologs, key=exp_orthologs.get)
         elif len(predicted_orthologs) > 0:
-            best_orth = sorted([(key, value) for key, value in predicted_orthologs.items()], key=lambda x: x[1],
-                               reverse=True)[0][0]
+            best_orth = max(predicted_orthologs, key=predicted_orthologs.get)
     return best_orth
@@ -1,13 +1,14 @@
 import logging
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
-from typing import List, Set, Union, Tuple, Any
+from typing import List, Set, Union, Tuple, Any, Dict
 
 from ontobio import Ontology
 from ontobio.assocmodel import AssociationSet
 
 from genedescriptions.commons import CommonAncestor, TrimmingResult
-from genedescriptions.ontology_tools import get_all_common_ancestors, set_ic_ontology_struct, set_ic_annot_freq
+from genedescriptions.ontology_tools import get_all_common_ancestors, set_ic_ontology_struct, set_ic_annot_freq, \
+    get_node_namespace
 from genedescriptions.optimization import find_set_covering
 
 logger = logging.getLogger(__name__)
@@ -19,9 +20,9 @@ class TrimmingAlgorithm(metaclass=ABCMeta):
                  slim_terms_ic_bonus_perc: int = 0, slim_set: set = None):
         self.ontology = ontology
         self.annotations = annotations
-        self.nodeids_blacklist = nodeids_blacklist
+        self.nodeids_blacklist = frozenset(nodeids_blacklist) if nodeids_blacklist else frozenset()
         self.slim_terms_ic_bonus_perc = slim_terms_ic_bonus_perc
-        self.slim_set = slim_set
+        self.slim_set = frozenset(slim_set) if slim_set else frozenset()
 
     @abstractmethod
     def trim(self, node_ids: List[Any], max_num_nodes: int = 5, min_distance_from_root: int = 0) -> TrimmingResult:
@@ -38,12 +39,25 @@ class TrimmingAlgorithm(metaclass=ABCMeta):
         """
         pass
 
+    @staticmethod
+    def get_untrimmed_result(node_ids: List[str]) -> TrimmingResult:
+        """get the result for a list of nodes that does not exceed the maximum number of nodes and therefore does not
+        need to be trimmed
+
+        Args:
+            node_ids (List[str]): the list of node ids
+        Returns:
+            TrimmingResult: a result containing the original nodes, each of which covers itself
+        """
+        return TrimmingResult(final_terms=list(node_ids), covered_nodes=set(node_ids))
+
     def get_trimming_result_from_set_covering(self, initial_node_ids: List[str],
-                                              set_covering_res: List[Tuple[str, Set[str]]]) -> TrimmingResult:
-        covered_terms = set([e for best_term_id, covered_terms in set_covering_res for e in covered_terms])
-        final_terms = [best_term_id for best_term_id, covered_terms in set_covering_res]
+                                              set_covering_res: Tuple[List[Tuple[str, Set[str]]], Set[str]]
+                                              ) -> TrimmingResult:
+        best_sets, covered_terms = set_covering_res
+        final_terms = [best_term_id for best_term_id, _ in best_sets]
         multicover_nodes = {self.ontology.label(term_id, id_if_null=True) for term_id, covered_nodes
-                            in set_covering_res if len(covered_nodes) > 1}
+                            in best_sets if len(covered_nodes) > 1}
         return TrimmingResult(final_terms=final_terms, partial_coverage=covered_terms != set(initial_node_ids),
                               covered_nodes=covered_terms, trimming_applied=final_terms != initial_node_ids,
                               multicovering_nodes=multicover_nodes)
@@ -93,18 +107,25 @@ class TrimmingAlgorithmIC(TrimmingAlgorithm):
         Returns:
             Set[str]: the set of trimmed terms, together with the set of original terms that each of them covers
         """
+        if len(node_ids) <= max_num_nodes:
+            return self.get_untrimmed_result(node_ids)
         common_ancestors = get_all_common_ancestors(node_ids=node_ids, ontology=self.ontology,
                                                     nodeids_blacklist=self.nodeids_blacklist)
-        values = [self.get_candidate_ic_value(candidate=candidate, node_ids=node_ids,
-                                              min_distance_from_root=min_distance_from_root,
-                                              slim_terms_ic_bonus_perc=self.slim_terms_ic_bonus_perc,
-                                              slim_set=self.slim_set) for candidate in common_ancestors]
-        if self.slim_set and any([node.node_id in self.slim_set for node in common_ancestors]):
+        if self.slim_set and any(node.node_id in self.slim_set for node in common_ancestors):
             logger.debug("some candidates are present in the slim set")
-        # remove ancestors with zero IC
-        common_ancestors = [common_ancestor for common_ancestor, value in zip(common_ancestors, values) if value > 0]
-        values = [value for value in values if value > 0]
-        best_terms = find_set_covering(subsets=common_ancestors, ontology=self.ontology, max_num_subsets=max_num_nodes,
+        node_ids_set = set(node_ids)
+        candidates = []
+        values = []
+        for candidate in common_ancestors:
+            value = self.get_candidate_ic_value(candidate=candidate, node_ids=node_ids_set,
+                                                min_distance_from_root=min_distance_from_root,
+                                                slim_terms_ic_bonus_perc=self.slim_terms_ic_bonus_perc,
+                                                slim_set=self.slim_set)
+            # remove ancestors with zero IC
+            if value > 0:
+                candidates.append(candidate)
+                values.append(value)
+        best_terms = find_set_covering(subsets=candidates, ontology=self.ontology, max_num_subsets=max_num_nodes,
                                        value=values)
         return self.get_trimming_result_from_set_covering(initial_node_ids=node_ids, set_covering_res=best_terms)
 
@@ -112,34 +133,41 @@ class TrimmingAlgorithmIC(TrimmingAlgorithm):
 class TrimmingAlgorithmLCA(TrimmingAlgorithm):
 
     def trim(self, node_ids: List[str], max_num_nodes: int = 3, min_distance_from_root: int = 0):
-        candidates_dict = {candidate.node_id: (candidate.node_label, candidate.covered_starting_nodes) for candidate in
+        if len(node_ids) <= max_num_nodes:
+            return self.get_untrimmed_result(node_ids)
+        candidates_dict = {candidate.node_id: candidate.covered_starting_nodes for candidate in
                            get_all_common_ancestors(node_ids=node_ids, ontology=self.ontology,
                                                     min_distance_from_root=min_distance_from_root,
                                                     nodeids_blacklist=self.nodeids_blacklist)}
         cands_ids_to_process = set(candidates_dict.keys())
         selected_cands_ids = []
-        node_to_cands_map = defaultdict(list)
+        node_to_cands_map = defaultdict(set)
         for cand in cands_ids_to_process:
-            for node in candidates_dict[cand][1]:
-                node_to_cands_map[node].append(cand)
+            for node in candidates_dict[cand]:
+                node_to_cands_map[node].add(cand)
+        cands_position = {cand_id: position for position, cand_id in enumerate(candidates_dict)}
+        cands_depth = {cand_id: self.ontology.node(cand_id)["depth"] for cand_id in candidates_dict}
         while len(cands_ids_to_process) > 0:
             cand_id = cands_ids_to_process.pop()
-            comparable_cands = [(cid, cval[1]) for cid, cval in candidates_dict.items() if cid != cand_id and all(
-                [child_id in cval[1] for child_id in candidates_dict[cand_id][1]])]
+            # the candidates covering all the nodes covered by the current one are those mapped to each of its nodes
+            comparable_cands_ids = set.intersection(*[node_to_cands_map[node] for node in candidates_dict[cand_id]])
+            comparable_cands_ids.discard(cand_id)
+            comparable_cands = [(cid, candidates_dict[cid]) for cid in sorted(comparable_cands_ids,
+                                                                              key=cands_position.get)]
             if len(comparable_cands) > 0:
-                max_len = max(map(lambda x: len(x[1]), comparable_cands))
-                best_cands = [candidate for candidate in comparable_cands if len(candidate[1]) == max_len]
+                comparable_cands_lens = [len(candidate[1]) for candidate in comparable_cands]
+                max_len = max(comparable_cands_lens)
+                best_cands = [candidate for candidate, cand_len in zip(comparable_cands, comparable_cands_lens) if
+                              cand_len == max_len]
                 if len(best_cands) > 1:
-                    weighted_best_cands = sorted([(self.ontology.node(cand[0])["depth"], cand) for cand in best_cands],
-                                                 key=lambda x: x[0], reverse=True)
-                    max_weight = max(map(lambda x: x[0], weighted_best_cands))
-                    best_cands = [wcand[1] for wcand in weighted_best_cands if wcand[0] == max_weight]
+                    max_weight = max(cands_depth[cand[0]] for cand in best_cands)
+                    best_cands = [cand for cand in best_cands if cands_depth[cand[0]] == max_weight]
                 else:
-                    max_weight = self.ontology.node(best_cands[0][0])["depth"]
-                if len(candidates_dict[cand_id][1]) > len(best_cands[0][1]) or \
-                    (len(candidates_dict[cand_id][1]) > len(best_cands[0][1]) and
-                     self.ontology.node(cand_id)["depth"] > max_weight):
-                    best_cands = [(cand_id, candidates_dict[cand_id][1])]
+                    max_weight = cands_depth[best_cands[0][0]]
+                if len(candidates_dict[cand_id]) > max_len or \
+                    (len(candidates_dict[cand_id]) > max_len and
+                     cands_depth[cand_id] > max_weight):
+                    best_cands = [(cand_id, candidates_dict[cand_id])]
                 for best_cand in best_cands:
                     selected_cands_ids.append(best_cand[0])
                     cands_ids_to_process = {cand_id for cand_id in cands_ids_to_process if best_cand[0] not in
@@ -147,15 +175,15 @@ class TrimmingAlgorithmLCA(TrimmingAlgorithm):
             else:
                 selected_cands_ids.append(cand_id)
         if len(selected_cands_ids) <= max_num_nodes:
-            multicover_nodes = {self.ontology.label(term_id, id_if_null=True) for term_id, candidate_info
-                                in candidates_dict.items() if len(candidate_info[1]) > 1}
+            multicover_nodes = {self.ontology.label(term_id, id_if_null=True) for term_id, covered_nodes
+                                in candidates_dict.items() if len(covered_nodes) > 1}
             return TrimmingResult(final_terms=selected_cands_ids, trimming_applied=True, partial_coverage=False,
                                   covered_nodes=set([covered_node for node_id in selected_cands_ids for covered_node in
-                                                     candidates_dict[node_id][1]]),
+                                                     candidates_dict[node_id]]),
                                   multicovering_nodes=multicover_nodes)
         else:
             best_terms = find_set_covering(
-                [CommonAncestor(node_id, self.ontology.label(node_id, id_if_null=True), candidates_dict[node_id][1])
+                [CommonAncestor(node_id, self.ontology.label(node_id, id_if_null=True), candidates_dict[node_id])
                  for node_id in selected_cands_ids], ontology=self.ontology, max_num_subsets=max_num_nodes)
             return self.get_trimming_result_from_set_covering(initial_node_ids=node_ids, set_covering_res=best_terms)
 
@@ -163,27 +191,27 @@ class TrimmingAlgorithmLCA(TrimmingAlgorithm):
 class TrimmingAlgorithmNaive(TrimmingAlgorithm):
 
     def trim(self, node_ids: List[str], max_num_nodes: int = 3, min_distance_from_root: int = 0):
+        if len(node_ids) <= max_num_nodes:
+            return self.get_untrimmed_result(node_ids)
         logger.debug("applying trimming through naive algorithm")
         final_terms_set = {}
         ancestor_paths = defaultdict(list)
         term_paths = defaultdict(set)
+        # paths from ancestors to the root are shared by all the terms with the same root
+        paths_cache_by_root = defaultdict(dict)
         # step 1: get all path for each term and populate data structures
         for node_id in node_ids:
-            node_root = None
-            node_ont = self.ontology.node(node_id)
-            if "meta" in node_ont and "basicPropertyValues" in node_ont["meta"]:
-                for basic_prop_val in node_ont["meta"]["basicPropertyValues"]:
-                    if basic_prop_val["pred"] == "OIO:hasOBONamespace":
-                        node_root = basic_prop_val["val"]
+            node_root = get_node_namespace(ontology=self.ontology, node_id=node_id)
             paths = self.get_all_paths_to_root(node_id=node_id, ontology=self.ontology,
                                                min_distance_from_root=min_distance_from_root, relations=None,
-                                               nodeids_blacklist=self.nodeids_blacklist, root_node=node_root)
+                                               nodeids_blacklist=self.nodeids_blacklist, root_node=node_root,
+                                               paths_cache=paths_cache_by_root[node_root])
+            term_paths[node_id].update(paths)
             for path in paths:
-                term_paths[node_id].add(path)
                 ancestor_paths[path[-1]].append(path)
         # step 2: merge terms and keep common ancestors
         for node_id in sorted(node_ids):
-            term_paths_copy = sorted(term_paths[node_id].copy(), key=lambda x: len(x))
+            term_paths_copy = sorted(term_paths[node_id], key=len)
             while len(term_paths_copy) > 0:
                 curr_path = list(term_paths_copy.pop())
                 selected_highest_ancestor = curr_path.pop()
@@ -193,16 +221,16 @@ class TrimmingAlgorithmNaive(TrimmingAlgorithm):
                 covered_nodes_set = set([related_path[0] for related_path in related_paths])
                 del ancestor_paths[selected_highest_ancestor]
                 if curr_path:
-                    if all(map(lambda x: x[0] == curr_path[0], related_paths)):
+                    if all(path[0] == curr_path[0] for path in related_paths):
                         selected_highest_ancestor = curr_path[0]
                     else:
                         i = -1
                         while len(curr_path) > 1:
                             i -= 1
                             curr_highest_ancestor = curr_path.pop()
-                            if not all(map(lambda x: len(x) >= - i, related_paths)):
+                            if not all(len(path) >= - i for path in related_paths):
                                 break
-                            if all(map(lambda x: x[i] == curr_highest_ancestor, related_paths)):
+                            if all(path[i] == curr_highest_ancestor for path in related_paths):
                                 selected_highest_ancestor = curr_highest_ancestor
                                 if selected_highest_ancestor in ancestor_paths:
                                     del ancestor_paths[selected_highest_ancestor]
@@ -232,7 +260,8 @@ class TrimmingAlgorithmNaive(TrimmingAlgorithm):
     @staticmethod
     def get_all_paths_to_root(node_id: str, ontology: Ontology, min_distance_from_root: int = 0,
                               relations: List[str] = None, nodeids_blacklist: List[str] = None,
-                              previous_path: Union[None, List[str]] = None, root_node=None) -> Set[Tuple[str]]:
+                              previous_path: Union[None, List[str]] = None, root_node=None,
+                              paths_cache: Dict[str, Set[Tuple[Tuple[str], str]]] = None) -> Set[Tuple[str]]:
         """get all possible paths connecting a go term to its root terms
 
         Args:
@@ -242,46 +271,37 @@ class TrimmingAlgorithmNaive(TrimmingAlgorithm):
             relations (List[str]): the list of relations to be used
             nodeids_blacklist (List[str]): a list of node ids to exclude from the paths
             previous_path (Union[None, List[str]]): the path to get to the current node
+            paths_cache (Dict[str, Set[Tuple[Tuple[str], str]]]): optional cache of the paths from visited nodes to the
+                root, to be shared by calls with the same ontology, relations, blacklist, root node and minimum distance
         Returns:
             Set[Tuple[str]]: the set of paths connecting the specified term to its root terms, each of which contains a
             sequence of terms ids
         """
-        if previous_path is None:
-            previous_path = []
-        new_path = previous_path[:]
-        if not nodeids_blacklist or node_id not in nodeids_blacklist:
-            new_path.append(node_id)
-        parents = [parent for parent in ontology.parents(node=node_id, relations=relations) if
-                   ontology.node(parent)["depth"] >= min_distance_from_root]
-        parents_same_root = []
-        if root_node:
-            for parent in parents:
-                parent_node = ontology.node(parent)
-                parent_root = None
-                if "meta" in parent_node and "basicPropertyValues" in parent_node["meta"]:
-                    for basic_prop_val in parent_node["meta"]["basicPropertyValues"]:
-                        if basic_prop_val["pred"] == "OIO:hasOBONamespace":
-                            parent_root = basic_prop_val["val"]
-                if parent_root and parent_root == root_node:
-                    parents_same_root.append(parent)
-            parents = parents_same_root
+        # paths from each visited node to the root are stored as (path, last node) pairs, so that nodes reachable
+        # through multiple routes in the DAG are visited only once. The last node is kept to be used as the path when
+        # all the nodes in it are blacklisted
+        paths_from_node = paths_cache if paths_cache is not None else {}
 
-        if len(parents) > 0:
-            # go up the tree, following a depth first visit
-            paths_to_return = set()
-            for parent in parents:
-                for path in TrimmingAlgorithmNaive.get_all_paths_to_root(node_id=parent, ontology=ontology,
-                                                                         previous_path=new_path,
-                                                                         min_distance_from_root=min_distance_from_root,
-                                                                         relations=relations,
-                                                                         nodeids_blacklist=nodeids_blacklist,
-                                                                         root_node=root_node):
-                    paths_to_return.add(path)
-            return paths_to_return
-        if len(new_path) == 0:
-            return {(node_id,)}
-        else:
-            return {tuple(new_path)}
+        def get_paths_from_node(curr_node_id):
+            if curr_node_id not in paths_from_node:
+                parents = [parent for parent in ontology.parents(node=curr_node_id, relations=relations) if
+                           ontology.node(parent)["depth"] >= min_distance_from_root]
+                if root_node:
+                    parents = [parent for parent in parents if get_node_namespace(ontology=ontology, node_id=parent)
+                               == root_node]
+                curr_node_path = (curr_node_id,) if not nodeids_blacklist or curr_node_id not in \
+                    nodeids_blacklist else ()
+                if len(parents) > 0:
+                    # go up the tree, following a depth first visit
+                    paths_from_node[curr_node_id] = {(curr_node_path + path, last_node_id) for parent in parents for
+                                                     path, last_node_id in get_paths_from_node(parent)}
+                else:
+                    paths_from_node[curr_node_id] = {(curr_node_path, curr_node_id)}
+            return paths_from_node[curr_node_id]
+
+        previous_path = tuple(previous_path) if previous_path else ()
+        return {previous_path + path if previous_path + path else (last_node_id,) for path, last_node_id in
+                get_paths_from_node(node_id)}
 
 
 CONF_TO_TRIMMING_CLASS = {
@@ -98,6 +98,29 @@ class TestGOModule(unittest.TestCase):
         self.df.set_associations(associations_type=DataType.GO, associations=assocs, config=self.conf_parser)
         self.assertTrue(self.df.go_associations)
 
+    def test_share_node_ids_with_ontology(self):
+        def create_associations():
+            # ids built at runtime, so that they are not the same objects as the ontology node ids
+            return AssociationSetFactory().create_from_assocs(assocs=[DataManager.create_annotation_record(
+                "", "1", "a", "protein_coding", "001", "GO:" + term_num, "", aspect, "EXP", None, "WB", "") for
+                term_num, aspect in [("0019901", "F"), ("0016301", "F"), ("0008286", "P"), ("0008340", "P")]],
+                ontology=self.df.go_ontology)
+
+        self.df.go_associations = create_associations()
+        annotations_before = self.df.get_annotations_for_gene(
+            gene_id="1", annot_type=DataType.GO, priority_list=self.conf_parser.get_annotations_priority(
+                module=Module.GO))
+        self.df.set_associations(associations_type=DataType.GO, associations=create_associations(),
+                                 config=self.conf_parser)
+        ontology_node_ids = {node_id: node_id for node_id in self.df.go_ontology.nodes()}
+        for association in self.df.go_associations.associations_by_subj["1"]:
+            self.assertIs(association["object"]["id"], ontology_node_ids[association["object"]["id"]])
+        annotations_after = self.df.get_annotations_for_gene(
+            gene_id="1", annot_type=DataType.GO, priority_list=self.conf_parser.get_annotations_priority(
+                module=Module.GO))
+        self.assertTrue(len(annotations_before) > 0)
+        self.assertEqual(annotations_before, annotations_after)
+
     def test_remap_associations(self):
         associations = []
         associations.append(DataManager.create_annotation_record("", "1", "a", "protein_coding", "001", "GO:0018996",
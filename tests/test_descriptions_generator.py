@@ -679,3 +679,29 @@ class TestDescriptionsGenerator(unittest.TestCase):
             aspect='F', qualifier='', merge_groups_with_same_prefix=True, keep_only_best_group=True)
         self.assertTrue("several" in sentences.get_description())
 
+    def test_get_module_sentences_does_not_modify_terms_groups(self):
+        go_sent_generator = OntologySentenceGenerator(gene_id="WB:WBGene00000099", module=Module.GO,
+                                                      data_manager=self.df, config=self.conf_parser)
+        terms_groups = {key: set(terms) for key, terms in go_sent_generator.terms_groups.items()}
+        merged_sentences = go_sent_generator.get_module_sentences(aspect='P', qualifier='',
+                                                                  merge_groups_with_same_prefix=True,
+                                                                  keep_only_best_group=True)
+        self.assertEqual(go_sent_generator.terms_groups, terms_groups)
+        sentences = go_sent_generator.get_module_sentences(aspect='P', qualifier='',
+                                                           merge_groups_with_same_prefix=False,
+                                                           keep_only_best_group=True)
+        self.assertEqual(go_sent_generator.terms_groups, terms_groups)
+        self.assertTrue(len(merged_sentences.get_initial_ids()) > 0)
+        self.assertEqual(sorted(merged_sentences.get_initial_ids()), sorted(sentences.get_initial_ids()))
+
+    def test_merge_postfix_phrases(self):
+        self.assertEqual(OntologySentenceGenerator.merge_postfix_phrases(["based on A evidence",
+                                                                          "based on B evidence"]),
+                         "based on A and B evidences")
+        self.assertEqual(OntologySentenceGenerator.merge_postfix_phrases(["based on data based on experiment",
+                                                                          "based on models"]),
+                         "based on data based on experiment and models")
+        self.assertEqual(OntologySentenceGenerator.merge_postfix_phrases(["", "based on models"]), "based on models")
+        self.assertEqual(OntologySentenceGenerator.merge_postfix_phrases(["inferred by curator",
+                                                                          "inferred by curator"]),
+                         "inferred by curator")
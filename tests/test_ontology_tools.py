@@ -2,13 +2,14 @@ import logging
 import unittest
 import os
 
-from ontobio import AssociationSetFactory, OntologyFactory
+from ontobio import AssociationSetFactory, OntologyFactory, Ontology
 
 from genedescriptions.commons import Module
 from genedescriptions.config_parser import GenedescConfigParser, ConfigModuleProperty
 from genedescriptions.data_manager import DataManager, DataType
 from genedescriptions.descriptions_generator import OntologySentenceGenerator
-from genedescriptions.ontology_tools import set_ic_ontology_struct, get_all_common_ancestors, set_ic_annot_freq
+from genedescriptions.ontology_tools import set_ic_ontology_struct, get_all_common_ancestors, set_ic_annot_freq, \
+    get_node_namespace, nodes_have_same_root
 
 logger = logging.getLogger("Gene Ontology Tools tests")
 
@@ -43,7 +44,7 @@ class TestOntologyTools(unittest.TestCase):
         self.load_go_ontology()
         generator = OntologySentenceGenerator(gene_id="WB:WBGene00000912", module=Module.GO,
                                               data_manager=self.df, config=self.conf_parser)
-        node_ids = generator.terms_groups[('P', '')]["EXPERIMENTAL"]
+        node_ids = generator.terms_groups[('P', '', "EXPERIMENTAL")]
         common_ancestors = get_all_common_ancestors(node_ids, ontology=generator.ontology)
         self.assertTrue(len(common_ancestors) > 0, "Common ancestors not found")
         associations = [association for subj_associations in self.df.go_associations.associations_by_subj.values() for
@@ -69,12 +70,26 @@ class TestOntologyTools(unittest.TestCase):
         self.conf_parser.config["go_sentences_options"]["exclude_terms"].append("GO:0040024")
         generator = OntologySentenceGenerator(gene_id="WB:WBGene00003931", module=Module.GO,
                                               data_manager=self.df, config=self.conf_parser)
-        node_ids = generator.terms_groups[('P', '')]["EXPERIMENTAL"]
+        node_ids = generator.terms_groups[('P', '', "EXPERIMENTAL")]
         common_ancestors = get_all_common_ancestors(node_ids, ontology=generator.ontology,
                                                     nodeids_blacklist=self.conf_parser.get_module_property(
                                                         module=Module.GO, prop=ConfigModuleProperty.EXCLUDE_TERMS))
         self.assertTrue("GO:0040024" not in common_ancestors, "Common ancestors contain blacklisted term")
 
+    def test_get_node_namespace(self):
+        ontology = Ontology()
+        ontology.add_node("A", "a")
+        ontology.node("A")["meta"] = {"basicPropertyValues": [{"pred": "OIO:hasOBONamespace",
+                                                                "val": "biological_process"}]}
+        ontology.add_node("B", "b")
+        ontology.node("B")["meta"] = {"basicPropertyValues": [{"pred": "OIO:hasOBONamespace",
+                                                                "val": "molecular_function"}]}
+        ontology.add_node("C", "c")
+        self.assertEqual(get_node_namespace(ontology=ontology, node_id="A"), "biological_process")
+        self.assertIsNone(get_node_namespace(ontology=ontology, node_id="C"))
+        self.assertEqual(nodes_have_same_root(["A", "C"], ontology=ontology), "biological_process")
+        self.assertFalse(nodes_have_same_root(["A", "B"], ontology=ontology))
+
     def test_information_content(self):
 
         #              0                   ic(0) = 0
@@ -14,7 +14,8 @@ class TestOptimization(unittest.TestCase):
                    CommonAncestor("5", "5", {"B"}), CommonAncestor("6", "6", {"C"})]
         values = [2, 12, 5, 20, 20, 20]
         # test with weights
-        set_covering = [best_set[0] for best_set in find_set_covering(subsets=subsets, value=values, max_num_subsets=3)]
+        set_covering = [best_set[0] for best_set in find_set_covering(subsets=subsets, value=values,
+                                                                      max_num_subsets=3)[0]]
         self.assertTrue("2" in set_covering)
         self.assertTrue("6" in set_covering)
         self.assertTrue("1" not in set_covering)
@@ -22,9 +23,11 @@ class TestOptimization(unittest.TestCase):
         self.assertTrue("4" not in set_covering)
         self.assertTrue("5" not in set_covering)
         # test without weights
-        set_covering_noweights = [best_set[0] for best_set in find_set_covering(subsets=subsets, value=None,
-                                                                                max_num_subsets=3)]
+        best_sets_noweights, covered_elements_noweights = find_set_covering(subsets=subsets, value=None,
+                                                                             max_num_subsets=3)
+        set_covering_noweights = [best_set[0] for best_set in best_sets_noweights]
         self.assertTrue("1" in set_covering_noweights and len(set_covering_noweights) == 1)
+        self.assertEqual(covered_elements_noweights, {"A", "B", "C"})
         # test wrong input
         costs_wrong = [1, 3]
         set_covering_wrong = find_set_covering(subsets=subsets, value=costs_wrong, max_num_subsets=3)
@@ -38,7 +41,8 @@ class TestOptimization(unittest.TestCase):
                    CommonAncestor("16", "16", {"16"}), CommonAncestor("17", "17", {"17"})]
         values = [1, 1, 0.875061263, 1.301029996, 1.301029996, 1.602059991, 1.301029996, 1.698970004, 1.698970004,
                   1.698970004, 1.698970004, 1.698970004]
-        set_covering = [best_set[0] for best_set in find_set_covering(subsets=subsets, value=values, max_num_subsets=3)]
+        set_covering = [best_set[0] for best_set in find_set_covering(subsets=subsets, value=values,
+                                                                      max_num_subsets=3)[0]]
         self.assertTrue(all([num in set_covering for num in ["2", "9", "11"]]))
 
     def test_set_covering_with_ontology(self):
@@ -92,5 +96,5 @@ class TestOptimization(unittest.TestCase):
                    CommonAncestor(node_id=13, node_label="13", covered_starting_nodes={"13"})]
 
         values = [1, 1, 1, 1, 1, 1, 1, 20, 1, 1, 100, 1, 1]
-        res = find_set_covering(subsets=subsets, ontology=ontology, value=values, max_num_subsets=2)
+        res, covered_elements = find_set_covering(subsets=subsets, ontology=ontology, value=values, max_num_subsets=2)
         self.assertTrue(all([sub[0] != 11 for sub in res]))
@@ -0,0 +1,66 @@
+import logging
+import multiprocessing
+import unittest
+import os
+
+from genedescriptions.api_manager import APIManager
+from genedescriptions.commons import Gene
+from genedescriptions.config_parser import GenedescConfigParser
+from genedescriptions.data_manager import DataType
+from wormbase import wormbase_pipeline
+from wormbase.wb_data_manager import WBDataManager
+
+logger = logging.getLogger("WormBase pipeline tests")
+
+
+class TestWormBasePipeline(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(filename=None, level="ERROR", format='%(asctime)s - %(name)s - %(levelname)s: %(message)s')
+        logger.info("Starting WormBase pipeline tests")
+        self.this_dir = os.path.split(__file__)[0]
+        self.conf_parser = GenedescConfigParser(os.path.join(self.this_dir, "config_test_wb.yml"))
+        self.df = WBDataManager(do_relations=None, go_relations=["subClassOf", "BFO:0000050"], config=self.conf_parser,
+                                species="c_elegans")
+        self.df.load_ontology_from_file(ontology_type=DataType.GO, ontology_url="file://" + os.path.join(
+            os.path.abspath(self.this_dir), os.pardir, "data", "go_gd_test.obo"),
+                                        ontology_cache_path=os.path.join(self.this_dir, "cache", "go_gd_test.obo"),
+                                        config=self.conf_parser)
+        self.df.load_associations_from_file(associations_type=DataType.GO, associations_url="file://" + os.path.join(
+            os.path.abspath(self.this_dir), os.pardir, "data", "gene_association_1.7.wb.partial"),
+                                            associations_cache_path=os.path.join(self.this_dir, "cache",
+                                                                                 "gene_association_1.7.wb.partial"),
+                                            config=self.conf_parser)
+        self.df.load_ontology_from_file(ontology_type=DataType.EXPR, ontology_url="file://" + os.path.join(
+            os.path.abspath(self.this_dir), "data", "anatomy_gd_test.obo"),
+                                        ontology_cache_path=os.path.join(self.this_dir, "cache",
+                                                                         "anatomy_gd_test.obo"),
+                                        config=self.conf_parser)
+        self.df.load_associations_from_file(associations_type=DataType.EXPR, associations_url="file://" + os.path.join(
+            os.path.abspath(self.this_dir), "data", "anatomy_gd_test.wb"),
+                                            associations_cache_path=os.path.join(self.this_dir, "cache",
+                                                                                 "anatomy_gd_test.wb"),
+                                            config=self.conf_parser)
+        self.genes = [Gene(gene_id, gene_name, False, False) for gene_id, gene_name in
+                      sorted(self.df.go_associations.subject_label_map.items())]
+        self.gene_desc_args = {"organism": "c_elegans", "species": self.conf_parser.get_wb_organisms_info(),
+                               "dm": self.df, "sister_df": None, "df_agr": None, "conf_parser": self.conf_parser,
+                               "human_genes_props": {}, "api_manager": APIManager(textpresso_api_token=None)}
+
+    def test_generate_gene_description_with_multiple_processes(self):
+        sequential_descs = [wormbase_pipeline.generate_gene_description(gene=gene, **self.gene_desc_args)
+                            for gene in self.genes]
+        wormbase_pipeline._SHARED_GENE_DESCRIPTION_DATA.update(self.gene_desc_args)
+        try:
+            with multiprocessing.get_context("fork").Pool(processes=2) as pool:
+                parallel_descs = list(pool.imap(wormbase_pipeline._generate_gene_description_with_shared_data,
+                                                self.genes, chunksize=2))
+        finally:
+            wormbase_pipeline._SHARED_GENE_DESCRIPTION_DATA.clear()
+        self.assertTrue(any(gene_desc.description for gene_desc in sequential_descs))
+        self.assertEqual(len(sequential_descs), len(parallel_descs))
+        for sequential_desc, parallel_desc in zip(sequential_descs, parallel_descs):
+            self.assertIsNone(parallel_desc.config)
+            self.assertEqual(sequential_desc.gene_id, parallel_desc.gene_id)
+            self.assertEqual(sequential_desc.description, parallel_desc.description)
+            self.assertEqual(vars(sequential_desc.stats), vars(parallel_desc.stats))
@@ -3,6 +3,7 @@
 import argparse
 import datetime
 import logging
+import multiprocessing
 import os
 
 from typing import List
@@ -23,6 +24,9 @@ from wormbase.wb_data_manager import WBDataManager
 
 
 USE_CACHE = True
+GENES_CHUNK_SIZE = 50
+
+_SHARED_GENE_DESCRIPTION_DATA = {}
 
 
 def load_data(organism, conf_parser: GenedescConfigParser):
@@ -221,6 +225,45 @@ def set_sister_species_sentence(dm: WBDataManager, conf_parser: GenedescConfigPa
                                                  ", " + best_ortholog[1] + " " +
                                                  sister_sp_module_sentences.get_description())
 
+
+def generate_gene_description(gene: Gene, organism: str, species, dm: WBDataManager, sister_df: WBDataManager,
+                              df_agr: DataManager, conf_parser: GenedescConfigParser, human_genes_props,
+                              api_manager: APIManager) -> GeneDescription:
+    logger = logging.getLogger("WB Gene Description Pipeline")
+    logger.debug("Generating description for gene " + gene.name)
+    gene_desc = GeneDescription(gene_id=gene.id, config=conf_parser, gene_name=gene.name, add_gene_name=False)
+    selected_orthologs, orth_sent = get_best_orthologs_and_sentence(
+        dm=dm, orth_fullnames=dm.orth_fullnames, human_genes_props=human_genes_props, gene_desc=gene_desc,
+        api_manager=api_manager, config=conf_parser)
+    set_gene_ontology_module(dm=dm, conf_parser=conf_parser, gene_desc=gene_desc, gene=gene)
+    set_tissue_expression_sentence(dm=dm, gene=gene, conf_parser=conf_parser, gene_desc=gene_desc)
+    if not gene_desc.description:
+        set_expression_cluster_sentence(dm=dm, conf_parser=conf_parser, gene_desc=gene_desc, gene=gene,
+                                        api_manager=api_manager)
+    set_disease_module(df=dm, conf_parser=conf_parser, gene=gene, gene_desc=gene_desc)
+    if not gene_desc.go_description:
+        set_information_poor_sentence(orth_fullnames=dm.orth_fullnames,
+                                      selected_orthologs=selected_orthologs, conf_parser=conf_parser,
+                                      human_df_agr=df_agr, gene_desc=gene_desc, dm=dm, gene=gene)
+    gene_desc.set_or_extend_module_description_and_final_stats(module=Module.ORTHOLOGY, description=orth_sent)
+    if "main_sister_species" in species[organism] and species[organism]["main_sister_species"] and \
+            dm.get_best_orthologs_for_gene(gene.id, orth_species_full_name=[dm.sister_sp_fullname],
+                                           sister_species_data_fetcher=sister_df,
+                                           ecode_priority_list=["EXP", "IDA", "IPI", "IMP", "IGI", "IEP", "HTP",
+                                                                "HDA", "HMP", "HGI", "HEP"])[0]:
+        set_sister_species_sentence(dm=dm, sister_sp_fullname=dm.sister_sp_fullname, sister_df=sister_df,
+                                    species=species, organism=organism, gene_desc=gene_desc,
+                                    conf_parser=conf_parser, gene=gene)
+    return gene_desc
+
+
+def _generate_gene_description_with_shared_data(gene: Gene) -> GeneDescription:
+    gene_desc = generate_gene_description(gene=gene, **_SHARED_GENE_DESCRIPTION_DATA)
+    # the parser is restored by the parent process, avoid pickling a copy of it for each gene
+    gene_desc.config = None
+    return gene_desc
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate gene descriptions for wormbase")
     parser.add_argument("-c", "--config-file", metavar="config_file", dest="config_file", type=str,
@@ -237,7 +280,12 @@ def main():
     parser.add_argument("-o", "--output-formats", metavar="output_formats", dest="output_formats", type=str, nargs="+",
                         default=["ace", "txt", "json", "tsv"], help="file formats to generate. Accepted values "
                                                                     "are: ace, txt, json, tsv")
+    parser.add_argument("-p", "--num-processes", metavar="num_processes", dest="num_processes", type=int, default=1,
+                        help="number of processes to use to generate the descriptions. Values greater than 1 "
+                             "require a platform supporting the fork start method. Default 1")
     args = parser.parse_args()
+    if args.num_processes > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        parser.error("multiple processes require the fork start method, which is not available on this platform")
     conf_parser = GenedescConfigParser(args.config_file)
     logging.basicConfig(filename=args.log_file, level=args.log_level, format='%(asctime)s - %(name)s - %(levelname)s:'
                                                                              '%(message)s', force=True)
@@ -254,32 +302,23 @@ def main():
         desc_writer.overall_properties.release_version = conf_parser.get_wb_release()[0:-1] + str(
             int(conf_parser.get_wb_release()[-1]) + 1)
         desc_writer.overall_properties.date = datetime.date.today().strftime("%B %d, %Y")
-        for gene in dm.get_gene_data():
-            logger.debug("Generating description for gene " + gene.name)
-            gene_desc = GeneDescription(gene_id=gene.id, config=conf_parser, gene_name=gene.name, add_gene_name=False)
-            selected_orthologs, orth_sent = get_best_orthologs_and_sentence(
-                dm=dm, orth_fullnames=dm.orth_fullnames, human_genes_props=human_genes_props, gene_desc=gene_desc,
-                api_manager=api_manager, config=conf_parser)
-            set_gene_ontology_module(dm=dm, conf_parser=conf_parser, gene_desc=gene_desc, gene=gene)
-            set_tissue_expression_sentence(dm=dm, gene=gene, conf_parser=conf_parser, gene_desc=gene_desc)
-            if not gene_desc.description:
-                set_expression_cluster_sentence(dm=dm, conf_parser=conf_parser, gene_desc=gene_desc, gene=gene,
-                                                api_manager=api_manager)
-            set_disease_module(df=dm, conf_parser=conf_parser, gene=gene, gene_desc=gene_desc)
-            if not gene_desc.go_description:
-                set_information_poor_sentence(orth_fullnames=dm.orth_fullnames,
-                                              selected_orthologs=selected_orthologs, conf_parser=conf_parser,
-                                              human_df_agr=df_agr, gene_desc=gene_desc, dm=dm, gene=gene)
-            gene_desc.set_or_extend_module_description_and_final_stats(module=Module.ORTHOLOGY, description=orth_sent)
-            if "main_sister_species" in species[organism] and species[organism]["main_sister_species"] and \
-                    dm.get_best_orthologs_for_gene(gene.id, orth_species_full_name=[dm.sister_sp_fullname],
-                                                   sister_species_data_fetcher=sister_df,
-                                                   ecode_priority_list=["EXP", "IDA", "IPI", "IMP", "IGI", "IEP", "HTP",
-                                                                        "HDA", "HMP", "HGI", "HEP"])[0]:
-                set_sister_species_sentence(dm=dm, sister_sp_fullname=dm.sister_sp_fullname, sister_df=sister_df,
-                                            species=species, organism=organism, gene_desc=gene_desc,
-                                            conf_parser=conf_parser, gene=gene)
-            desc_writer.add_gene_desc(gene_desc)
+        gene_desc_args = {"organism": organism, "species": species, "dm": dm, "sister_df": sister_df,
+                          "df_agr": df_agr, "conf_parser": conf_parser, "human_genes_props": human_genes_props,
+                          "api_manager": api_manager}
+        if args.num_processes > 1:
+            # data is shared with the worker processes through fork, so that it is not pickled for each gene
+            _SHARED_GENE_DESCRIPTION_DATA.update(gene_desc_args)
+            try:
+                with multiprocessing.get_context("fork").Pool(processes=args.num_processes) as pool:
+                    for gene_desc in pool.imap(_generate_gene_description_with_shared_data, dm.get_gene_data(),
+                                               chunksize=GENES_CHUNK_SIZE):
+                        gene_desc.config = conf_parser
+                        desc_writer.add_gene_desc(gene_desc)
+            finally:
+                _SHARED_GENE_DESCRIPTION_DATA.clear()
+        else:
+            for gene in dm.get_gene_data():
+                desc_writer.add_gene_desc(generate_gene_description(gene=gene, **gene_desc_args))
         logger.info("All genes processed for " + organism)
         date_prefix = datetime.date.today().strftime("%Y%m%d")
         if "json" in args.output_formats: